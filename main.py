@@ -1,11 +1,20 @@
 import argparse
+import asyncio
+import functools
 import httpx
+import orjson
 import os
 import sys
-import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 from typing import Any, Union
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 from loguru import logger
@@ -20,6 +29,213 @@ BASE_URL_REST_LOCAL = os.getenv('OBSIDIAN_BASE_URL') # HTTP: 27123, HTTPS: 27124
 
 BASE_URL_OMNI_SEARCH = os.getenv('OBSIDIAN_OMNI_SEARCH_BASE_URL') # HTTP: 51361
 
+# リクエストヘッダー（呼び出しごとに組み立てず、起動時に一度だけ生成する）
+AUTH_HEADERS = MappingProxyType({"Authorization": f"Bearer {API_KEY}"})
+ACCEPT_MARKDOWN_HEADERS = MappingProxyType({"Accept": "text/markdown"})
+ACCEPT_NOTE_JSON_HEADERS = MappingProxyType({"Accept": "application/vnd.olrapi.note+json"})
+CONTENT_TYPE_MARKDOWN_HEADERS = MappingProxyType({"Content-Type": "text/markdown"})
+NO_HEADERS = MappingProxyType({})
+
+# 全ツールで共有する HTTP クライアントの接続プール・タイムアウト設定
+# keepalive_expiry は Local REST API 側のアイドルタイムアウトに合わせて長めに取る
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0)
+# 接続確立の失敗は早めに検知し、大きなノートの読み込みには余裕を持たせる
+HTTP_TIMEOUT = httpx.Timeout(connect=2.0, write=5.0, read=15.0, pool=2.0)
+# 大きなノートの PUT は書き込み完了後のレスポンス待ちが長くなるため read を延ばす
+UPDATE_FILE_TIMEOUT = httpx.Timeout(connect=2.0, write=5.0, read=30.0, pool=2.0)
+
+# 複数ファイルを並行取得する際の同時リクエスト数の上限
+FILE_FETCH_CONCURRENCY = 10
+
+# 条件付きリクエストでの再検証に使うレスポンスヘッダー
+CACHED_RESPONSE_HEADERS = ('content-type', 'etag', 'last-modified')
+
+
+class ResponseCache:
+    """
+    ETag / Last-Modified と本文を保持する、TTL 付きの LRU キャッシュです。
+
+    同じキーへの同時アクセスは、処理中のリクエスト 1 件の結果を共有し、API へのリクエストを 1 回にまとめます。
+    処理中のリクエストは完了時に破棄するため、保持数は同時に処理中のキーの数までに収まります。
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict[str, str], bytes]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def share(
+        self,
+        key: tuple[str, str],
+        fetch: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+        # 呼び出し元の 1 つがキャンセルされても、結果を待っている他の呼び出し元には影響させない
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 待機者が全員キャンセル済みでも「例外が取得されなかった」警告を出さない
+            task.exception()
+
+    def get(self, key: tuple[str, str]) -> Union[tuple[dict[str, str], bytes], None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, headers, content = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return headers, content
+
+    def put(self, key: tuple[str, str], headers: dict[str, str], content: bytes) -> None:
+        self._entries[key] = (time.monotonic(), headers, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+@dataclass
+class AppContext:
+    rest_client: httpx.AsyncClient
+    omni_client: httpx.AsyncClient
+    response_cache: ResponseCache
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+    """
+    サーバー起動時に Local REST API / Omni Search 用の HTTP クライアントを生成し、終了時に閉じます。
+
+    ツール呼び出しごとに接続を張り直さず、同じコネクションプールを使い回します。
+    """
+    async with (
+        httpx.AsyncClient(
+            base_url=BASE_URL_REST_LOCAL or "",
+            headers=AUTH_HEADERS,
+            http2=True,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        ) as rest_client,
+        httpx.AsyncClient(
+            base_url=BASE_URL_OMNI_SEARCH or "",
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        ) as omni_client,
+    ):
+        yield AppContext(rest_client=rest_client, omni_client=omni_client, response_cache=ResponseCache())
+
+
+def vault_path(filename: str) -> str:
+    """
+    Vault 内のファイルパスを、共有クライアントの base_url からの相対 URL パスに変換します。
+
+    スペースや '#', '?' を含むファイル名でも正しく送信できるよう、'/' 以外をパーセントエンコードします。
+    """
+    return f"/vault/{quote(filename, safe='/')}"
+
+
+async def find_keyword_paths(client: httpx.AsyncClient, keyword: str) -> Union[set[str], None]:
+    """
+    POST /search/simple でキーワードを含むファイルのパスを取得します。
+
+    simple search は大文字小文字を区別しない部分一致のため、キーワードを含むファイルを取りこぼしません。
+    取得に失敗した場合は None を返し、呼び出し側は絞り込みなしで処理を続けます。
+    """
+    try:
+        response = await client.post("/search/simple", params={"query": keyword, "contextLength": 0})
+        response.raise_for_status()
+        return {item["filename"] for item in orjson.loads(response.content)}
+    except Exception as e:
+        logger.warning(f"/search/simple による絞り込みをスキップします: {str(e)}")
+        return None
+
+
+async def get_with_revalidation(
+    app: AppContext,
+    url: str,
+    headers: Mapping[str, str],
+    use_last_modified: bool = True,
+) -> httpx.Response:
+    """
+    Local REST API へ GET し、キャッシュ済みのエントリがあれば If-None-Match / If-Modified-Since で再検証します。
+
+    304 が返った場合は本文を転送せず、キャッシュ済みの本文から 200 のレスポンスを組み立てて返します。
+    /active のように同じ URL が別のファイルを指しうる場合は use_last_modified=False とし、ETag だけで再検証します
+    （Last-Modified では、より古い別のノートに切り替わったときに 304 が返ってしまうため）。
+    """
+    validators = ("etag", "last-modified") if use_last_modified else ("etag",)
+    cache = app.response_cache
+    key = (url, headers.get("Accept", ""))
+
+    async def fetch() -> httpx.Response:
+        cached = cache.get(key)
+        request_headers = dict(headers)
+        if cached is not None:
+            cached_headers, _ = cached
+            if "etag" in cached_headers:
+                request_headers["If-None-Match"] = cached_headers["etag"]
+            if "last-modified" in cached_headers and use_last_modified:
+                request_headers["If-Modified-Since"] = cached_headers["last-modified"]
+
+        response = await app.rest_client.get(url, headers=request_headers)
+        if response.status_code == 304 and cached is not None:
+            cached_headers, content = cached
+            cache.put(key, cached_headers, content)
+            return httpx.Response(200, headers=cached_headers, content=content, request=response.request)
+
+        if response.status_code == 200 and any(v in response.headers for v in validators):
+            cached_headers = {k: response.headers[k] for k in CACHED_RESPONSE_HEADERS if k in response.headers}
+            cache.put(key, cached_headers, response.content)
+        return response
+
+    return await cache.share(key, fetch)
+
+
+def format_error(e: Exception, action: str) -> str:
+    """例外からツールの戻り値・ログに使うエラーメッセージを組み立てます。"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"Error: Received status code {e.response.status_code} when trying to {action}.\n url: {e.request.url}"
+    return f"Failed to {action}: {str(e)}"
+
+
+async def report_error(ctx: Context, error_msg: str) -> None:
+    """エラーをログに出力し、MCP クライアントにも通知します。"""
+    logger.error(error_msg)
+    await ctx.error(error_msg)
+
+
+def mcp_tool_wrap(
+    action: str,
+    error_result: Callable[[str], Any] = lambda error_msg: {"error": error_msg},
+):
+    """
+    ツール共通の例外処理をまとめるデコレーターです。
+
+    ツール内で発生した例外（raise_for_status による HTTPStatusError を含む）を捕捉してエラーを通知し、
+    error_result で組み立てた値を返します。action にはツールの引数を str.format 形式で埋め込めます。
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(ctx: Context, **kwargs):
+            try:
+                return await fn(ctx, **kwargs)
+            except Exception as e:
+                error_msg = format_error(e, action.format(**kwargs))
+                await report_error(ctx, error_msg)
+                return error_result(error_msg)
+        return wrapper
+    return decorator
+
+
 # MCP サーバーの初期化
 mcp = FastMCP(
     'self.obsidian-mcp-server',
@@ -29,41 +245,34 @@ mcp = FastMCP(
     このサーバーは、Obsidian Local REST API と通信するためのツールを提供します。
     """,
     dependencies=[
-        'httpx',
+        'httpx[http2]',
         'loguru',
+        'orjson',
         'pydantic'
-    ]
+    ],
+    lifespan=app_lifespan,
 )
 
 @mcp.tool()
-async def get_status(ctx: Context) -> dict[str, Any]:
+@mcp_tool_wrap("get status")
+async def get_status(ctx: Context) -> Union[dict[str, Any], str]:
     """
     Obsidian Local REST API の基本情報（サーバーステータス）を取得します。
 
     GET / エンドポイントを呼び出し、認証情報もヘッダーに含めて接続します。
     """
-    url = f"{BASE_URL_REST_LOCAL}"
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            error_msg = f"Error: Received status code {response.status_code} from Obsidian API."
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return {"error": error_msg}
-        return json.dumps(response.json(), ensure_ascii=False, indent=2)
-    except Exception as e:
-        error_msg = f"Failed to get status: {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return {"error": error_msg}
+    client = ctx.request_context.lifespan_context.rest_client
+    response = await client.get("/")
+    response.raise_for_status()
+    # JSON をパースして再シリアライズせず、受け取った本文をそのまま返す
+    return response.text
 
 @mcp.tool()
+@mcp_tool_wrap("perform Omni Search", error_result=lambda error_msg: [{"error": error_msg}])
 async def omni_search(
     ctx: Context,
     q: str = Field(description="検索クエリ。`q`: 'query'で指定する。"),
-) -> list[dict[str, Any]]:
+) -> Union[list[dict[str, Any]], str]:
     """
     Omni Search を使用して、Vault 内の全ファイルに対して指定されたクエリを評価し、一致する結果のみを返します。
 
@@ -73,25 +282,16 @@ async def omni_search(
         - "#prompts,useEffect"
     """
     # Omni Search のエンドポイントを使用
-    url = f"{BASE_URL_OMNI_SEARCH}/search"
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params={"q": q}, timeout=10)
-            print(response.url)
-        if response.status_code != 200:
-            error_msg = f"Error: Received status code {response.status_code} from Omni Search."
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [{"error": error_msg}]
-        return json.dumps(response.json(), ensure_ascii=False, indent=2)
-    except Exception as e:
-        error_msg = f"Failed to perform Omni Search: {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return [{"error": error_msg}]
+    client = ctx.request_context.lifespan_context.omni_client
+    response = await client.get("/search", params={"q": q})
+    logger.debug("omni_search url={}", response.url)
+    response.raise_for_status()
+    # JSON をパースして再シリアライズせず、受け取った本文をそのまま返す
+    return response.text
 
 
 # @mcp.tool()
+@mcp_tool_wrap("perform search", error_result=lambda error_msg: [{"error": error_msg}])
 async def search(
     ctx: Context,
     query: str = Field(description="検索クエリ（Dataview DQL または JsonLogic の形式）"),
@@ -99,7 +299,7 @@ async def search(
         default="application/vnd.olrapi.dataview.dql+txt",
         description="クエリの Content-Type ヘッダ（例: application/vnd.olrapi.dataview.dql+txt または application/vnd.olrapi.jsonlogic+json）"
     )
-) -> list[dict[str, Any]]:
+) -> Union[list[dict[str, Any]], str]:
     """
     Vault内の全ファイルに対して、指定されたクエリを評価し、一致する結果のみを返します。
 
@@ -111,27 +311,15 @@ async def search(
     - `inbox`ディレクトリ内の`#lang/react`タグと`#prompts`を持つノートを取得する場合:
         - Dataview DQL: TABLE FROM "inbox" WHERE contains(file.tags, "#lang/react") AND contains(file.tags, "#prompts") SORT rating DESC
     """
-    url = f"{BASE_URL_REST_LOCAL}/search"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": content_type,
-    }
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, data=query, timeout=10)
-        if response.status_code != 200:
-            error_msg = f"Error: Received status code {response.status_code} from /search/ endpoint."
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [{"error": error_msg}]
-        return json.dumps(response.json(), ensure_ascii=False, indent=2)
-    except Exception as e:
-        error_msg = f"Failed to perform search: {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return [{"error": error_msg}]
+    client = ctx.request_context.lifespan_context.rest_client
+    headers = {"Content-Type": content_type}
+    response = await client.post("/search", headers=headers, content=query)
+    response.raise_for_status()
+    # JSON をパースして再シリアライズせず、受け取った本文をそのまま返す
+    return response.text
 
 @mcp.tool()
+@mcp_tool_wrap("find a file matching '{match_keyword}'")
 async def search_and_find_matching_file(
     ctx: Context,
     query: str = Field(description="検索クエリ（Dataview DQL または JsonLogic）"),
@@ -156,59 +344,71 @@ async def search_and_find_matching_file(
     - `inbox`ディレクトリ内の`#lang/react`タグと`#prompts`を持つノートを取得する場合:
         - Dataview DQL: TABLE FROM "inbox" WHERE contains(file.tags, "#lang/react") AND contains(file.tags, "#prompts") SORT rating DESC
     """
-    search_url = f"{BASE_URL_REST_LOCAL}/search"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": content_type,
-    }
-
+    client = ctx.request_context.lifespan_context.rest_client
+    headers = {"Content-Type": content_type}
+
+    # Markdown 本文を探す場合は /search/simple を並行して呼び出し、取得するファイルをキーワードを含むものに絞り込む
+    # （as_json の場合はメタデータ側でも一致しうるため絞り込まない）
+    keyword_paths = None
+    if not as_json and match_keyword.strip():
+        search_response, keyword_paths = await asyncio.gather(
+            client.post("/search", headers=headers, content=query),
+            find_keyword_paths(client, match_keyword),
+        )
+    else:
+        search_response = await client.post("/search", headers=headers, content=query)
+    search_response.raise_for_status()
+
+    results = orjson.loads(search_response.content)
+    if not results:
+        return orjson.dumps({"message": "検索結果がありませんでした。"}).decode()
+
+    # 各ファイルを並行して取得して条件チェック
+    file_headers = ACCEPT_NOTE_JSON_HEADERS if as_json else ACCEPT_MARKDOWN_HEADERS
+    sem = asyncio.Semaphore(FILE_FETCH_CONCURRENCY)
+
+    # as_json の場合、本文中の '"' や '\\'、改行は JSON エスケープされているため、キーワードも同じ形にエスケープして探す
+    json_needle = orjson.dumps(match_keyword)[1:-1]
+
+    async def fetch_and_check(filename: str) -> Union[str, None]:
+        async with sem:
+            file_response = await client.get(vault_path(filename), headers=file_headers)
+        if file_response.status_code != 200:
+            logger.warning(f"ファイル取得失敗: {filename}")
+            return None
+
+        # デコードの前に生のバイト列でキーワードを探し、一致したファイルだけを結果にする
+        body = file_response.content
+        needle = json_needle if as_json else match_keyword.encode(file_response.encoding or "utf-8")
+        if needle not in body:
+            return None
+        # FastMCP に dict のまま渡すと json.dumps(ensure_ascii=True) で再エンコードされるため、ここで一度だけ文字列化する
+        # （as_json の本文はパースせず、そのまま埋め込む）
+        content = orjson.Fragment(body) if as_json else file_response.text
+        return orjson.dumps({
+            "filename": filename,
+            "content": content
+        }).decode()
+
+    filenames = [item.get("file", {}).get("path") for item in results]
+    if keyword_paths is not None:
+        filenames = [filename for filename in filenames if filename in keyword_paths]
+    tasks = [asyncio.create_task(fetch_and_check(filename)) for filename in filenames if filename]
     try:
-        async with httpx.AsyncClient() as client:
-            search_response = await client.post(search_url, headers=headers, data=query, timeout=10)
-        if search_response.status_code != 200:
-            error_msg = f"Search error: status code {search_response.status_code}"
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return {"error": error_msg}
-
-        results = search_response.json()
-        if not results:
-            return {"message": "検索結果がありませんでした。"}
-
-        # 各ファイルを1つずつ取得して条件チェック
-        async with httpx.AsyncClient() as client:
-            for item in results:
-                filename = item.get("file", {}).get("path")
-                if not filename:
-                    continue
-
-                file_url = f"{BASE_URL_REST_LOCAL}/vault/{filename}"
-                file_headers = {
-                    "Authorization": f"Bearer {API_KEY}",
-                    "Accept": "application/vnd.olrapi.note+json" if as_json else "text/markdown"
-                }
-
-                file_response = await client.get(file_url, headers=file_headers, timeout=10)
-                if file_response.status_code != 200:
-                    logger.warning(f"ファイル取得失敗: {filename}")
-                    continue
-
-                content = file_response.json() if as_json else file_response.text
-                if match_keyword in (str(content) if as_json else content):
-                    return {
-                        "filename": filename,
-                        "content": content
-                    }
-
-        return {"message": f"指定されたキーワード '{match_keyword}' を含むファイルは見つかりませんでした。"}
-
-    except Exception as e:
-        error_msg = f"search_and_find_matching_file エラー: {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return {"error": error_msg}
+        # 検索結果の順序を保ち、先頭側で一致したファイルが見つかった時点で残りを打ち切る
+        for task in tasks:
+            matched = await task
+            if matched:
+                return matched
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return orjson.dumps({"message": f"指定されたキーワード '{match_keyword}' を含むファイルは見つかりませんでした。"}).decode()
 
 @mcp.tool()
+@mcp_tool_wrap("retrieve active note")
 async def get_active_note(
     ctx: Context,
     as_json: bool = Field(
@@ -221,30 +421,16 @@ async def get_active_note(
 
     as_json が True の場合、JSON 形式（タグやメタデータ付き）のノート情報を返します。
     """
-    url = f"{BASE_URL_REST_LOCAL}/active"
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-    if as_json:
-        headers["Accept"] = "application/vnd.olrapi.note+json"
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            error_msg = f"Error: Received status code {response.status_code} when retrieving active note."
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return {"error": error_msg}
-        if as_json:
-            return response.json()
-        else:
-            return response.text
-    except Exception as e:
-        error_msg = f"Failed to retrieve active note: {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return {"error": error_msg}
+    app = ctx.request_context.lifespan_context
+    headers = ACCEPT_NOTE_JSON_HEADERS if as_json else NO_HEADERS
+    response = await get_with_revalidation(app, "/active", headers, use_last_modified=False)
+    response.raise_for_status()
+    # as_json の場合も本文はすでに JSON 文字列なので、パースせずそのまま返す
+    return response.text
 
 
 @mcp.tool()
+@mcp_tool_wrap("retrieve file '{filename}'")
 async def get_file(
     ctx: Context,
     filename: str = Field(description="Vault ルートからの相対パス（例: 'dirname/example.md'）"),
@@ -258,32 +444,60 @@ async def get_file(
 
     GET /vault/{filename} エンドポイントを呼び出し、ファイルの内容を取得します。
     """
-    url = f"{BASE_URL_REST_LOCAL}/vault/{filename}"
+    app = ctx.request_context.lifespan_context
+    url = vault_path(filename)
     logger.debug(f"Retrieving file from URL: {url}")
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Accept": "application/vnd.olrapi.note+json" if as_json else "text/markdown",
-    }
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            error_msg = f"Error: Received status code {response.status_code} when retrieving file.\n url: {url}"
-            logger.error(error_msg)
-            await ctx.error(error_msg)
+    headers = ACCEPT_NOTE_JSON_HEADERS if as_json else ACCEPT_MARKDOWN_HEADERS
+    response = await get_with_revalidation(app, url, headers)
+    response.raise_for_status()
+    # as_json の場合も本文はすでに JSON 文字列なので、パースせずそのまま返す
+    return response.text
+
+
+@mcp.tool()
+@mcp_tool_wrap("retrieve files")
+async def get_files(
+    ctx: Context,
+    filenames: list[str] = Field(description="Vault ルートからの相対パスのリスト（例: ['dirname/example.md', 'other.md']）"),
+    as_json: bool = Field(
+        default=False,
+        description="ノートを JSON 形式で返す場合は True、Markdown 形式の場合は False"
+    )
+) -> Union[dict[str, Any], str]:
+    """
+    指定した複数ファイルの内容をまとめて取得します。
+
+    GET /vault/{filename} を並行して呼び出し、ファイル名をキーとした JSON オブジェクトの文字列で返します。
+    取得に失敗したファイルは {"error": ...} を値とし、残りのファイルの取得は継続します。
+    """
+    app = ctx.request_context.lifespan_context
+    headers = ACCEPT_NOTE_JSON_HEADERS if as_json else ACCEPT_MARKDOWN_HEADERS
+    sem = asyncio.Semaphore(FILE_FETCH_CONCURRENCY)
+
+    async def fetch(filename: str) -> Union[dict[str, Any], orjson.Fragment, str]:
+        try:
+            async with sem:
+                response = await get_with_revalidation(app, vault_path(filename), headers)
+            response.raise_for_status()
+            if as_json:
+                # JSON の本文はパースせず、そのまま結果に埋め込む
+                return orjson.Fragment(response.content)
+            else:
+                return response.text
+        except Exception as e:
+            # 1 ファイルの失敗でバッチ全体を失敗させず、そのファイルの値としてエラーを返す
+            error_msg = format_error(e, f"retrieve file '{filename}'")
+            await report_error(ctx, error_msg)
             return {"error": error_msg}
-        if as_json:
-            return response.json()
-        else:
-            return response.text
-    except Exception as e:
-        error_msg = f"Failed to retrieve file '{filename}': {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return {"error": error_msg}
+
+    unique_filenames = list(dict.fromkeys(filenames))
+    contents = await asyncio.gather(*(fetch(filename) for filename in unique_filenames))
+    # FastMCP に dict のまま渡すと json.dumps(ensure_ascii=True) で再エンコードされるため、ここで一度だけ文字列化する
+    return orjson.dumps(dict(zip(unique_filenames, contents))).decode()
 
 
 @mcp.tool()
+@mcp_tool_wrap("update file '{filename}'", error_result=lambda error_msg: error_msg)
 async def update_file(
     ctx: Context,
     filename: str = Field(description="Vault ルートからの相対パス（例: 'example.md'）"),
@@ -294,25 +508,15 @@ async def update_file(
 
     PUT /vault/{filename} エンドポイントを呼び出し、Markdown コンテンツを送信します。
     """
-    url = f"{BASE_URL_REST_LOCAL}/vault/{filename}"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "text/markdown",
-    }
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, headers=headers, data=content, timeout=10)
-        if response.status_code not in (200, 204):
-            error_msg = f"Error: Received status code {response.status_code} when updating file."
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
-        return f"File '{filename}' updated successfully."
-    except Exception as e:
-        error_msg = f"Failed to update file '{filename}': {str(e)}"
-        logger.error(error_msg)
-        await ctx.error(error_msg)
-        return error_msg
+    client = ctx.request_context.lifespan_context.rest_client
+    response = await client.put(
+        vault_path(filename),
+        headers=CONTENT_TYPE_MARKDOWN_HEADERS,
+        content=content,
+        timeout=UPDATE_FILE_TIMEOUT,
+    )
+    response.raise_for_status()
+    return f"File '{filename}' updated successfully."
 
 def main():
     """CLI 引数に対応して MCP サーバーを起動します。"""